@@ -14,7 +14,15 @@
    GNU General Public License for more details.
 """
 from __future__ import annotations
+from bisect import bisect_left, insort
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Generic, NamedTuple, TypeVar
+from urllib.parse import urlencode
+import asyncio
 import hashlib
+import json
 import requests
 
 ReturnAlias = int | list[dict[str, str | int | bool]]
@@ -26,28 +34,228 @@ DataAlias = list[dict[str, str | int | bool]] | dict[str, str | int | bool]
 AltDataAlias = (list[dict[str, str | int | bool]]
                 | dict[str, str | int | bool] | list[str])
 
+T = TypeVar("T")
 
-def _check(resp: requests.models.Response) -> None:
+API_URL = "https://haveibeenpwned.com/api/v3/"
+
+RANGE_URL = "https://api.pwnedpasswords.com/range/"
+
+
+class Request(NamedTuple, Generic[T]):
+    """A description of a single API call, built by PwnedCore without
+    performing any I/O. A driver sends a GET request to url with
+    headers, then hands the response status code and body bytes to
+    parse to produce the result."""
+    url: str
+    headers: dict[str, str]
+    parse: Callable[[int, bytes], T]
+
+
+def status_message(status_code: int, body: bytes) -> str | None:
+    """Returns a description of any response code other than a 200 OK,
+    or None if there is nothing to report."""
+    if status_code == 400:
+        return ("Bad request: The account does not comply with an" +
+                " acceptable format (i.e. it's an empty string)")
+    if status_code == 401:
+        return "Unauthorized — the API key provided was not valid"
+    if status_code == 403:
+        return "Forbidden: No user agent has been specified in the request"
+    if status_code == 404:
+        return ("Not found: The account could not be found and" +
+                " has therefore not been pwned")
+    if status_code == 429:
+        return ("Too many requests: The rate limit has been exceeded\n\n" +
+                body.decode("utf-8", errors="replace"))
+    return None
+
+
+def parse_breaches(status_code: int, body: bytes) -> int | list[Any]:
+    """Parses a breach or paste response, wrapping a single JSON object
+    in a list. Returns the status code of anything other than a 200."""
+    if status_code == 200:
+        alt_data = json.loads(body)
+        if not isinstance(alt_data, list):
+            return [alt_data]
+        return alt_data
+    return status_code
+
+
+def parse_list(status_code: int, body: bytes) -> int | list[Any]:
+    """Parses a response which must be a JSON array. Returns the status
+    code of anything other than a 200 containing an array."""
+    if status_code == 200:
+        alt_data = json.loads(body)
+        if isinstance(alt_data, list):
+            return alt_data
+    return status_code
+
+
+def parse_password(suffix: str, status_code: int, body: bytes) -> int | str:
+    """Scans a range response for a hash suffix and returns the count
+    of that hash as a string, or '0' if it is not present. Returns the
+    status code of anything other than a 200."""
+    if status_code != 200:
+        return status_code
+    key = suffix.upper().encode("ascii") + b":"
+    start = body.find(key)
+    while start > 0 and body[start - 1:start] != b"\n":
+        start = body.find(key, start + 1)
+    if start < 0:
+        return "0"
+    end = body.find(b"\n", start)
+    if end < 0:
+        end = len(body)
+    return body[start + len(key):end].strip().decode("ascii")
+
+
+def parse_hashes(status_code: int, body: bytes) -> int | str:
+    """Returns a range response as plaintext, or the status code of
+    anything other than a 200."""
+    if status_code == 200:
+        return body.decode("utf-8")
+    return status_code
+
+
+def parse_breach_index(results: list[int | list[Any]],
+                       index: BreachIndex | None = None) -> int | BreachIndex:
+    """Builds or refreshes a BreachIndex from the parsed responses of
+    the requests returned by PwnedCore.breach_index. Returns the status
+    code of the first request which failed."""
+    breaches, classes = results
+    if isinstance(breaches, int):
+        return breaches
+    if isinstance(classes, int):
+        return classes
+    if index is None:
+        index = BreachIndex()
+    index.rebuild(breaches)
+    index.set_data_classes(classes)
+    return index
+
+
+class PwnedCore:
+    """The protocol half of the API wrapper. Each function takes the
+    same arguments as its Pwned counterpart and returns a Request
+    describing the call, so any transport can send it and parse the
+    response with the same code. No I/O is performed here. The
+    exception is breach_index, which returns a list of Requests whose
+    parsed responses are passed to parse_breach_index.
+
+
+       Class Functions:: (see Pwned DocStrings for details)
+
+           search_all_breaches
+           all_breaches
+           single_breach
+           data_classes
+           search_pastes
+           search_password
+           search_hashes
+           breach_index
+
+
+       Usage::
+
+         >>> core = PwnedCore("test@example.com", "My_App", "My_API_Key")
+         >>> request = core.search_password("BadPassword")
+         >>> data = request.parse(200, b"...")
+    """
+
+    def __init__(self, account: str, agent: str, key: str) -> None:
+        self.account = account
+        self.agent = agent
+        self.key = key
+        self.header: dict[str, str] = {
+            "User-Agent": self.agent,
+            "hibp-api-key": self.key
+        }
+
+    def _request(self,
+                 path: str,
+                 parse: Callable[[int, bytes], T],
+                 params: dict[str, str] | None = None,
+                 url: str = API_URL) -> Request[T]:
+        """Helper function to build a Request with a query string."""
+        if params:
+            path = path + "?" + urlencode(params)
+        return Request(url + path, self.header, parse)
+
+    def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> Request[AltReturnAlias]:
+        """Returns a Request for Pwned.search_all_breaches."""
+        params: dict[str, str] = {}
+        if not truncate:
+            params["truncateResponse"] = "false"
+        if domain:
+            params["domain"] = domain
+        if unverified:
+            params["includeUnverified"] = "true"
+        return self._request("breachedaccount/" + self.account,
+                             parse_breaches, params)
+
+    def all_breaches(self, domain: str | None = None) -> Request[ReturnAlias]:
+        """Returns a Request for Pwned.all_breaches."""
+        params: dict[str, str] = {}
+        if domain:
+            params["domain"] = domain
+        return self._request("breaches", parse_list, params)
+
+    def single_breach(self, name: str) -> Request[ReturnAlias]:
+        """Returns a Request for Pwned.single_breach."""
+        return self._request("breach/" + name, parse_breaches)
+
+    def data_classes(self) -> Request[int | list[str]]:
+        """Returns a Request for Pwned.data_classes."""
+        return self._request("dataclasses", parse_list)
+
+    def search_pastes(self) -> Request[ReturnAlias]:
+        """Returns a Request for Pwned.search_pastes."""
+        return self._request("pasteaccount/" + self.account, parse_breaches)
+
+    def search_password(self, password: str) -> Request[int | str]:
+        """Returns a Request for Pwned.search_password. Only the first
+        5 characters of the password hash are sent; the rest are kept
+        by the parser to scan the response."""
+        hash_object = hashlib.sha1(bytes(password, encoding="utf-8"))
+        hexdig = hash_object.hexdigest().upper()
+        return self._request(hexdig[:5],
+                             partial(parse_password, hexdig[5:]),
+                             url=RANGE_URL)
+
+    def search_hashes(self, hsh: str) -> Request[int | str]:
+        """Returns a Request for Pwned.search_hashes."""
+        return self._request(hsh[:5], parse_hashes, url=RANGE_URL)
+
+    def breach_index(self) -> list[Request[int | list[Any]]]:
+        """Returns the all_breaches and data_classes Requests for
+        Pwned.breach_index. Their parsed responses, in order, are
+        passed to parse_breach_index."""
+        return [
+            self._request("breaches", parse_list),
+            self._request("dataclasses", parse_list)
+        ]
+
+
+def _check(status_code: int, body: bytes) -> None:
     """Helper function to check the response code and prints anything
     other than a 200 OK."""
+    message = status_message(status_code, body)
+    if message is not None:
+        print(message)
+
 
-    try:
-        if resp.status_code == 400:
-            print("Bad request: The account does not comply with an" +
-                  " acceptable format (i.e. it's an empty string)")
-        elif resp.status_code == 401:
-            print("Unauthorized — the API key provided was not valid")
-        elif resp.status_code == 403:
-            print("Forbidden: No user agent has" +
-                  " been specified in the request")
-        elif resp.status_code == 404:
-            print("Not found: The account could not be found and" +
-                  " has therefore not been pwned")
-        elif resp.status_code == 429:
-            print("Too many requests: The rate limit has been exceeded\n")
-            print(resp.text)
-    except requests.RequestException:
-        print("ERROR: Could not connect to server")
+def _get(request: Request[T], timeout: int) -> T:
+    """Helper function to send a Request with blocking I/O and parse
+    the response."""
+    resp = requests.get(request.url,
+                        headers=request.headers,
+                        timeout=timeout)
+    _check(resp.status_code, resp.content)
+    return request.parse(resp.status_code, resp.content)
 
 
 class Pwned:
@@ -198,6 +406,9 @@ class Pwned:
            search_pastes
            search_password
            search_hashes
+           breach_index
+           send
+           send_all
 
 
        Usage::
@@ -205,30 +416,72 @@ class Pwned:
          >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
          >>> data = foo.search_password("BadPassword")
     """
-    url: str
-    resp: requests.models.Response
-    truncate_string: str
-    domain_string: str
-    unverified_string: str
-    classes: list[str]
-    hashes: str
-    hash_list: list[str]
-    hexdig: str
-    hsh: str
-    pnum: str
-    data: DataAlias
-    alt_data: AltDataAlias
 
     def __init__(self, account: str, agent: str, key: str) -> None:
-        self.account = account
-        self.agent = agent
-        self.key = key
-        self.header: dict[str, str] = {
-            "User-Agent": self.agent,
-            "hibp-api-key": self.key
-        }
+        self.core = PwnedCore(account, agent, key)
         self.timeout = 300
 
+    @property
+    def account(self) -> str:
+        """The account being queried, shared with self.core."""
+        return self.core.account
+
+    @account.setter
+    def account(self, account: str) -> None:
+        self.core.account = account
+
+    @property
+    def agent(self) -> str:
+        """The User-Agent, shared with self.core."""
+        return self.core.agent
+
+    @agent.setter
+    def agent(self, agent: str) -> None:
+        self.core.agent = agent
+
+    @property
+    def key(self) -> str:
+        """The API key, shared with self.core."""
+        return self.core.key
+
+    @key.setter
+    def key(self, key: str) -> None:
+        self.core.key = key
+
+    @property
+    def header(self) -> dict[str, str]:
+        """The request headers, shared with self.core."""
+        return self.core.header
+
+    @header.setter
+    def header(self, header: dict[str, str]) -> None:
+        self.core.header = header
+
+    def send(self, request: Request[T]) -> T:
+        """Sends a Request built by PwnedCore and returns the parsed
+        response.
+
+
+           Usage::
+
+             >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
+             >>> data = foo.send(foo.core.search_password("BadPassword"))
+        """
+        return _get(request, self.timeout)
+
+    def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        """Sends each Request in turn and returns the parsed responses
+        in the same order.
+
+
+           Usage::
+
+             >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
+             >>> data = foo.send_all(foo.core.search_password(password)
+             ...                     for password in ["pass", "word"])
+        """
+        return [self.send(request) for request in batch]
+
     def search_all_breaches(self,
                             truncate: bool | None = False,
                             domain: str | None = None,
@@ -270,30 +523,8 @@ class Pwned:
              >>> data = foo.search_all_breaches(domain='adobe.com')
              >>> data = foo.search_all_breaches(truncate=True, unverified=True)
         """
-        url = "https://haveibeenpwned.com/api/v3/breachedaccount/"
-        if truncate:
-            truncate_string = ""
-        else:
-            truncate_string = "?truncateResponse=false"
-        if not domain:
-            domain_string = ""
-        else:
-            domain_string = "?domain=" + domain
-        if unverified:
-            unverified_string = "?includeUnverified=true"
-        else:
-            unverified_string = ""
-        resp = requests.get(url + self.account + truncate_string +
-                            domain_string + unverified_string,
-                            timeout=self.timeout,
-                            headers=self.header)
-        _check(resp)
-        if resp.status_code == 200:
-            alt_data = resp.json()
-            if not isinstance(alt_data, list):
-                return [alt_data]
-            return alt_data
-        return resp.status_code
+        return self.send(
+            self.core.search_all_breaches(truncate, domain, unverified))
 
     def all_breaches(self, domain: str | None = None) -> ReturnAlias:
         """Retrieves all breached sites from the system. The result set
@@ -310,20 +541,7 @@ class Pwned:
              >>> data = foo.all_breaches()
              >>> data = foo.all_breaches(domain="adobe.com")
         """
-        url = "https://haveibeenpwned.com/api/v3/breaches"
-        if not domain:
-            domain_string = ""
-        else:
-            domain_string = "?domain=" + domain
-        resp = requests.get(url + domain_string,
-                            headers=self.header,
-                            timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            data = resp.json()
-            if isinstance(data, list):
-                return data
-        return resp.status_code
+        return self.send(self.core.all_breaches(domain))
 
     def single_breach(self, name: str) -> ReturnAlias:
         """
@@ -338,17 +556,7 @@ class Pwned:
              >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
              >>> data = foo.single_breach("adobe")
         """
-        url = "https://haveibeenpwned.com/api/v3/breach/"
-        resp = requests.get(url + name,
-                            headers=self.header,
-                            timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            data = resp.json()
-            if not isinstance(data, list):
-                return [data]
-            # return data  # Pretty sure will never hit
-        return resp.status_code
+        return self.send(self.core.single_breach(name))
 
     def data_classes(self) -> int | list[str]:
         """Returns all data classes in the system.
@@ -359,14 +567,7 @@ class Pwned:
              >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
              >>> data = foo.data_classes()
         """
-        url = "https://haveibeenpwned.com/api/v3/dataclasses"
-        resp = requests.get(url, headers=self.header, timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            classes = resp.json()
-            if isinstance(classes, list):
-                return classes
-        return resp.status_code
+        return self.send(self.core.data_classes())
 
     def search_pastes(self) -> ReturnAlias:
         """Returns all pastes for an account. Unlike searching for
@@ -414,17 +615,7 @@ class Pwned:
              >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
              >>> data = foo.search_pastes()
         """
-        url = "https://haveibeenpwned.com/api/v3/pasteaccount/"
-        resp = requests.get(url + self.account,
-                            headers=self.header,
-                            timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            data = resp.json()
-            if not isinstance(data, list):
-                return [data]
-            return data
-        return resp.status_code
+        return self.send(self.core.search_pastes())
 
     def search_password(self, password: str) -> int | str:
         """Returns an integer of how many times the password appears in
@@ -450,23 +641,7 @@ class Pwned:
               >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
               >>> data = foo.search_password("BadPassword")
         """
-        url = "https://api.pwnedpasswords.com/range/"
-        hash_object = hashlib.sha1(bytes(password, encoding="utf-8"))
-        hexdig = hash_object.hexdigest()
-        hexdig = hexdig.upper()
-        hsh = hexdig[:5]
-        pnum = '0'
-        resp = requests.get(url + hsh,
-                            headers=self.header,
-                            timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            hash_list = resp.text.splitlines()
-            for item in hash_list:
-                if item[0:35] == hexdig[5:]:
-                    pnum = item[36:]
-            return pnum
-        return resp.status_code
+        return self.send(self.core.search_password(password))
 
     def search_hashes(self, hsh: str) -> int | str:
         """Returns a string of plaintext hashes which are suffixes to the
@@ -494,13 +669,453 @@ class Pwned:
              >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
              >>> data = foo.search_hashes("21BD1")
         """
-        url = "https://api.pwnedpasswords.com/range/"
-        hsh = hsh[:5]
-        resp = requests.get(url + hsh,
-                            headers=self.header,
-                            timeout=self.timeout)
-        _check(resp)
-        if resp.status_code == 200:
-            hashes = resp.text
-            return hashes
-        return resp.status_code
+        return self.send(self.core.search_hashes(hsh))
+
+    def breach_index(self,
+                     index: BreachIndex | None = None) -> int | BreachIndex:
+        """Returns a BreachIndex built from all_breaches and data_classes,
+        so repeated catalog queries (by data class, domain or date) do not
+        need another API call or a linear scan of the breach list. An
+        existing index can be passed in to be refreshed incrementally,
+        in which case only new, modified or removed breaches are
+        re-indexed.
+
+
+           Usage::
+
+             >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
+             >>> index = foo.breach_index()
+             >>> index = foo.breach_index(index)
+        """
+        return parse_breach_index(self.send_all(self.core.breach_index()),
+                                  index)
+
+
+class ThreadedPwned:
+    """A Pwned client which sends requests from a thread pool. Every
+    function takes the same arguments as its Pwned counterpart but
+    returns a concurrent.futures.Future, so many calls can be in flight
+    at once. Use it as a context manager, or call close, to shut the
+    pool down.
+
+
+       Class Functions:: (see Pwned DocStrings for details)
+
+           search_all_breaches
+           all_breaches
+           single_breach
+           data_classes
+           search_pastes
+           search_password
+           search_hashes
+           breach_index
+           send
+           send_all
+           close
+
+
+       Usage::
+
+         >>> with ThreadedPwned("test@example.com", "My_App",
+         ...                    "My_API_Key", max_workers=8) as foo:
+         ...     future = foo.search_password("BadPassword")
+         ...     data = future.result()
+    """
+
+    def __init__(self,
+                 account: str,
+                 agent: str,
+                 key: str,
+                 max_workers: int | None = None) -> None:
+        self.core = PwnedCore(account, agent, key)
+        self.timeout = 300
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> ThreadedPwned:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Waits for pending requests and shuts the thread pool down."""
+        self.executor.shutdown()
+
+    def send(self, request: Request[T]) -> Future[T]:
+        """Submits a Request built by PwnedCore to the thread pool."""
+        return self.executor.submit(_get, request, self.timeout)
+
+    def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        """Sends every Request concurrently and returns the parsed
+        responses in the same order."""
+        futures = [self.send(request) for request in batch]
+        return [future.result() for future in futures]
+
+    def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> Future[AltReturnAlias]:
+        """See Pwned.search_all_breaches."""
+        return self.send(
+            self.core.search_all_breaches(truncate, domain, unverified))
+
+    def all_breaches(self, domain: str | None = None) -> Future[ReturnAlias]:
+        """See Pwned.all_breaches."""
+        return self.send(self.core.all_breaches(domain))
+
+    def single_breach(self, name: str) -> Future[ReturnAlias]:
+        """See Pwned.single_breach."""
+        return self.send(self.core.single_breach(name))
+
+    def data_classes(self) -> Future[int | list[str]]:
+        """See Pwned.data_classes."""
+        return self.send(self.core.data_classes())
+
+    def search_pastes(self) -> Future[ReturnAlias]:
+        """See Pwned.search_pastes."""
+        return self.send(self.core.search_pastes())
+
+    def search_password(self, password: str) -> Future[int | str]:
+        """See Pwned.search_password."""
+        return self.send(self.core.search_password(password))
+
+    def search_hashes(self, hsh: str) -> Future[int | str]:
+        """See Pwned.search_hashes."""
+        return self.send(self.core.search_hashes(hsh))
+
+    def breach_index(
+            self,
+            index: BreachIndex | None = None) -> Future[int | BreachIndex]:
+        """See Pwned.breach_index. Both catalog requests are sent
+        concurrently."""
+        futures = [self.send(request) for request in self.core.breach_index()]
+        result: Future[int | BreachIndex] = Future()
+
+        def finish(_: Future[int | list[Any]]) -> None:
+            try:
+                result.set_result(
+                    parse_breach_index(
+                        [future.result() for future in futures], index))
+            except Exception as error:  # pylint: disable=broad-except
+                result.set_exception(error)
+
+        futures[0].add_done_callback(
+            lambda _: futures[1].add_done_callback(finish))
+        return result
+
+
+class AsyncPwned:
+    """A Pwned client for asyncio. Every function takes the same
+    arguments as its Pwned counterpart and must be awaited. Requests are
+    sent with the blocking client in the default executor, so the event
+    loop is never blocked.
+
+
+       Class Functions:: (see Pwned DocStrings for details)
+
+           search_all_breaches
+           all_breaches
+           single_breach
+           data_classes
+           search_pastes
+           search_password
+           search_hashes
+           breach_index
+           send
+           send_all
+
+
+       Usage::
+
+         >>> foo = AsyncPwned("test@example.com", "My_App", "My_API_Key")
+         >>> data = await foo.search_password("BadPassword")
+         >>> data = await foo.send_all(foo.core.search_password(password)
+         ...                           for password in ["pass", "word"])
+    """
+
+    def __init__(self, account: str, agent: str, key: str) -> None:
+        self.core = PwnedCore(account, agent, key)
+        self.timeout = 300
+
+    async def send(self, request: Request[T]) -> T:
+        """Sends a Request built by PwnedCore and returns the parsed
+        response."""
+        return await asyncio.to_thread(_get, request, self.timeout)
+
+    async def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        """Sends every Request concurrently and returns the parsed
+        responses in the same order."""
+        coroutines: list[Awaitable[T]] = [
+            self.send(request) for request in batch
+        ]
+        return list(await asyncio.gather(*coroutines))
+
+    async def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> AltReturnAlias:
+        """See Pwned.search_all_breaches."""
+        return await self.send(
+            self.core.search_all_breaches(truncate, domain, unverified))
+
+    async def all_breaches(self, domain: str | None = None) -> ReturnAlias:
+        """See Pwned.all_breaches."""
+        return await self.send(self.core.all_breaches(domain))
+
+    async def single_breach(self, name: str) -> ReturnAlias:
+        """See Pwned.single_breach."""
+        return await self.send(self.core.single_breach(name))
+
+    async def data_classes(self) -> int | list[str]:
+        """See Pwned.data_classes."""
+        return await self.send(self.core.data_classes())
+
+    async def search_pastes(self) -> ReturnAlias:
+        """See Pwned.search_pastes."""
+        return await self.send(self.core.search_pastes())
+
+    async def search_password(self, password: str) -> int | str:
+        """See Pwned.search_password."""
+        return await self.send(self.core.search_password(password))
+
+    async def search_hashes(self, hsh: str) -> int | str:
+        """See Pwned.search_hashes."""
+        return await self.send(self.core.search_hashes(hsh))
+
+    async def breach_index(self,
+                           index: BreachIndex | None = None
+                           ) -> int | BreachIndex:
+        """See Pwned.breach_index. Both catalog requests are sent
+        concurrently."""
+        return parse_breach_index(
+            await self.send_all(self.core.breach_index()), index)
+
+
+class BreachIndex:
+    """Precomputed indexes over the breach catalog returned by
+    Pwned.all_breaches. The index is built once and then answers
+    catalog questions from memory:
+
+        with_data_classes     names of breaches exposing every given
+                              data class (set intersection)
+        domain                all breaches against a domain
+        added_between         names of breaches by AddedDate range
+        breached_between      names of breaches by BreachDate range
+        pwn_count             aggregated PwnCount totals
+
+    Date ranges are half-open [start, end) and compared as ISO 8601
+    strings, so either a date ("2024-01-31") or a full timestamp
+    ("2024-01-31T12:00:00Z") may be used as a bound.
+
+    The index can be kept current without rebuilding it from scratch:
+    update adds or replaces individual breaches (unchanged breaches,
+    judged by ModifiedDate, are skipped), remove drops one, rebuild
+    syncs against a complete catalog and set_data_classes registers the
+    output of Pwned.data_classes.
+
+
+       Usage::
+
+         >>> foo = Pwned("test@example.com", "My_App", "My_API_Key")
+         >>> index = BreachIndex(foo.all_breaches(), foo.data_classes())
+         >>> names = index.with_data_classes("Passwords", "Phone numbers")
+         >>> adobe = index.domain("adobe.com")
+         >>> recent = index.added_between("2024-01-01")
+         >>> total = index.pwn_count(names)
+    """
+    breaches: dict[str, Mapping[str, object]]
+    classes: dict[str, set[str]]
+    domains: dict[str, set[str]]
+    added: list[tuple[str, str]]
+    breached: list[tuple[str, str]]
+    class_totals: dict[str, int]
+    total: int
+
+    def __init__(self,
+                 breaches: Iterable[Mapping[str, object]] = (),
+                 data_classes: Iterable[str] | None = None) -> None:
+        self.breaches = {}
+        self.classes = {}
+        self.domains = {}
+        self.added = []
+        self.breached = []
+        self.class_totals = {}
+        self.total = 0
+        self.update(breaches)
+        if data_classes is not None:
+            self.set_data_classes(data_classes)
+
+    def __len__(self) -> int:
+        return len(self.breaches)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.breaches
+
+    def _add(self, name: str, breach: Mapping[str, object]) -> None:
+        """Adds a copy of a single breach to every index, so records
+        changed by the caller cannot desync the index."""
+        breach = _copy_breach(breach)
+        self.breaches[name] = breach
+        count = _int_field(breach, "PwnCount")
+        self.total += count
+        for data_class in _list_field(breach, "DataClasses"):
+            self.classes.setdefault(data_class, set()).add(name)
+            self.class_totals[data_class] = (
+                self.class_totals.get(data_class, 0) + count)
+        domain = _str_field(breach, "Domain").lower()
+        if domain:
+            self.domains.setdefault(domain, set()).add(name)
+        insort(self.added, (_str_field(breach, "AddedDate"), name))
+        insort(self.breached, (_str_field(breach, "BreachDate"), name))
+
+    def _discard(self, name: str) -> None:
+        """Removes a single breach from every index."""
+        breach = self.breaches.pop(name)
+        count = _int_field(breach, "PwnCount")
+        self.total -= count
+        for data_class in _list_field(breach, "DataClasses"):
+            self.classes[data_class].discard(name)
+            self.class_totals[data_class] -= count
+        domain = _str_field(breach, "Domain").lower()
+        if domain:
+            self.domains[domain].discard(name)
+            if not self.domains[domain]:
+                del self.domains[domain]
+        for dates, field in ((self.added, "AddedDate"),
+                             (self.breached, "BreachDate")):
+            del dates[bisect_left(dates, (_str_field(breach, field), name))]
+
+    def update(self, breaches: Iterable[Mapping[str, object]]) -> None:
+        """Adds new breaches and re-indexes changed ones. A breach that
+        is already indexed with the same ModifiedDate (or identical data)
+        is left alone."""
+        for breach in breaches:
+            name = _str_field(breach, "Name")
+            old = self.breaches.get(name)
+            if old is not None:
+                modified = _str_field(breach, "ModifiedDate")
+                if old == breach or (modified and modified == _str_field(
+                        old, "ModifiedDate")):
+                    continue
+                self._discard(name)
+            self._add(name, breach)
+
+    def remove(self, name: str) -> None:
+        """Removes a breach from the index, if present."""
+        if name in self.breaches:
+            self._discard(name)
+
+    def rebuild(self, breaches: Iterable[Mapping[str, object]]) -> None:
+        """Syncs the index with a complete catalog, such as a fresh
+        all_breaches response. Breaches missing from the catalog are
+        removed and only new or modified breaches are re-indexed."""
+        breaches = list(breaches)
+        current = {_str_field(breach, "Name") for breach in breaches}
+        for name in [name for name in self.breaches if name not in current]:
+            self._discard(name)
+        self.update(breaches)
+
+    def set_data_classes(self, data_classes: Iterable[str]) -> None:
+        """Registers every data class in the system, as returned by
+        Pwned.data_classes, so that classes no breach exposes yet are
+        still known to the index. Classes that are no longer listed and
+        are not referenced by any indexed breach are dropped."""
+        data_classes = set(data_classes)
+        for data_class in list(self.classes):
+            if data_class not in data_classes and not self.classes[
+                    data_class]:
+                del self.classes[data_class]
+                del self.class_totals[data_class]
+        for data_class in data_classes:
+            self.classes.setdefault(data_class, set())
+            self.class_totals.setdefault(data_class, 0)
+
+    def data_classes(self) -> list[str]:
+        """Returns every data class known to the index, sorted."""
+        return sorted(self.classes)
+
+    def with_data_classes(self, *data_classes: str) -> set[str]:
+        """Returns the names of breaches which exposed all of the given
+        data classes. Sets are intersected smallest first."""
+        if not data_classes:
+            return set(self.breaches)
+        sets = sorted((self.classes.get(data_class, set())
+                       for data_class in data_classes),
+                      key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def domain(self, domain: str) -> list[Mapping[str, object]]:
+        """Returns copies of all breaches against a domain, sorted by
+        name."""
+        names = self.domains.get(domain.lower(), set())
+        return [_copy_breach(self.breaches[name]) for name in sorted(names)]
+
+    def added_between(self,
+                      start: str | None = None,
+                      end: str | None = None) -> list[str]:
+        """Returns the names of breaches with an AddedDate in the range
+        [start, end), oldest first."""
+        return _date_range(self.added, start, end)
+
+    def breached_between(self,
+                         start: str | None = None,
+                         end: str | None = None) -> list[str]:
+        """Returns the names of breaches with a BreachDate in the range
+        [start, end), oldest first."""
+        return _date_range(self.breached, start, end)
+
+    def pwn_count(self, names: Iterable[str] | None = None) -> int:
+        """Returns the summed PwnCount of the named breaches, or of the
+        whole catalog if no names are given."""
+        if names is None:
+            return self.total
+        return sum(_int_field(self.breaches[name], "PwnCount")
+                   for name in names if name in self.breaches)
+
+    def data_class_pwn_count(self, data_class: str) -> int:
+        """Returns the summed PwnCount of every breach which exposed the
+        given data class."""
+        return self.class_totals.get(data_class, 0)
+
+
+def _copy_breach(breach: Mapping[str, object]) -> dict[str, object]:
+    """Helper function to copy a breach, including its DataClasses."""
+    copy = dict(breach)
+    if isinstance(copy.get("DataClasses"), list):
+        copy["DataClasses"] = _list_field(breach, "DataClasses")
+    return copy
+
+
+def _str_field(breach: Mapping[str, object], field: str) -> str:
+    """Helper function to read a string attribute from a breach."""
+    value = breach.get(field)
+    return value if isinstance(value, str) else ""
+
+
+def _int_field(breach: Mapping[str, object], field: str) -> int:
+    """Helper function to read an integer attribute from a breach."""
+    value = breach.get(field)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return 0
+
+
+def _list_field(breach: Mapping[str, object], field: str) -> list[str]:
+    """Helper function to read a string array attribute from a breach."""
+    value = breach.get(field)
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def _date_range(dates: list[tuple[str, str]], start: str | None,
+                end: str | None) -> list[str]:
+    """Helper function to slice a sorted (date, name) array by a
+    half-open ISO 8601 date range."""
+    low = 0 if start is None else bisect_left(dates, start,
+                                              key=lambda item: item[0])
+    high = len(dates) if end is None else bisect_left(
+        dates, end, key=lambda item: item[0])
+    return [name for _, name in dates[low:high]]
@@ -1,7 +1,9 @@
 """__init__.pyi"""
 
 from __future__ import annotations
-import requests
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Generic, NamedTuple, TypeVar
 
 ReturnAlias = int | list[dict[str, str | int | bool]]
 
@@ -12,30 +14,144 @@ DataAlias = list[dict[str, str | int | bool]] | dict[str, str | int | bool]
 AltDataAlias = (list[dict[str, str | int | bool]]
                 | dict[str, str | int | bool] | list[str])
 
+T = TypeVar("T")
 
-def _check(resp: requests.models.Response) -> None:
+API_URL: str
+
+RANGE_URL: str
+
+
+class Request(NamedTuple, Generic[T]):
+    url: str
+    headers: dict[str, str]
+    parse: Callable[[int, bytes], T]
+
+
+def status_message(status_code: int, body: bytes) -> str | None:
+    ...
+
+
+def parse_breaches(status_code: int, body: bytes) -> int | list[Any]:
+    ...
+
+
+def parse_list(status_code: int, body: bytes) -> int | list[Any]:
+    ...
+
+
+def parse_password(suffix: str, status_code: int, body: bytes) -> int | str:
+    ...
+
+
+def parse_hashes(status_code: int, body: bytes) -> int | str:
+    ...
+
+
+def parse_breach_index(results: list[int | list[Any]],
+                       index: BreachIndex | None = None) -> int | BreachIndex:
+    ...
+
+
+class PwnedCore:
+
+    account: str
+    agent: str
+    key: str
+    header: dict[str, str]
+
+    def __init__(self, account: str, agent: str, key: str) -> None:
+        ...
+
+    def _request(self,
+                 path: str,
+                 parse: Callable[[int, bytes], T],
+                 params: dict[str, str] | None = None,
+                 url: str = API_URL) -> Request[T]:
+        ...
+
+    def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> Request[AltReturnAlias]:
+        ...
+
+    def all_breaches(self, domain: str | None = None) -> Request[ReturnAlias]:
+        ...
+
+    def single_breach(self, name: str) -> Request[ReturnAlias]:
+        ...
+
+    def data_classes(self) -> Request[int | list[str]]:
+        ...
+
+    def search_pastes(self) -> Request[ReturnAlias]:
+        ...
+
+    def search_password(self, password: str) -> Request[int | str]:
+        ...
+
+    def search_hashes(self, hsh: str) -> Request[int | str]:
+        ...
+
+    def breach_index(self) -> list[Request[int | list[Any]]]:
+        ...
+
+
+def _check(status_code: int, body: bytes) -> None:
+    ...
+
+
+def _get(request: Request[T], timeout: int) -> T:
     ...
 
 
 class Pwned:
 
-    url: str
-    resp: requests.models.Response
-    truncate_string: str
-    domain_string: str
-    unverified_string: str
-    classes: list[str]
-    hashes: str
-    hash_list: list[str]
-    hexdig: str
-    hsh: str
-    pnum: str
-    data: DataAlias
-    alt_data: AltDataAlias
+    core: PwnedCore
+    timeout: int
 
     def __init__(self, account: str, agent: str, key: str) -> None:
         ...
 
+    @property
+    def account(self) -> str:
+        ...
+
+    @account.setter
+    def account(self, account: str) -> None:
+        ...
+
+    @property
+    def agent(self) -> str:
+        ...
+
+    @agent.setter
+    def agent(self, agent: str) -> None:
+        ...
+
+    @property
+    def key(self) -> str:
+        ...
+
+    @key.setter
+    def key(self, key: str) -> None:
+        ...
+
+    @property
+    def header(self) -> dict[str, str]:
+        ...
+
+    @header.setter
+    def header(self, header: dict[str, str]) -> None:
+        ...
+
+    def send(self, request: Request[T]) -> T:
+        ...
+
+    def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        ...
+
     def search_all_breaches(self,
                             truncate: bool | None = False,
                             domain: str | None = None,
@@ -59,3 +175,197 @@ class Pwned:
 
     def search_hashes(self, hsh: str) -> int | str:
         ...
+
+    def breach_index(self,
+                     index: BreachIndex | None = None) -> int | BreachIndex:
+        ...
+
+
+class ThreadedPwned:
+
+    core: PwnedCore
+    timeout: int
+    executor: ThreadPoolExecutor
+
+    def __init__(self,
+                 account: str,
+                 agent: str,
+                 key: str,
+                 max_workers: int | None = None) -> None:
+        ...
+
+    def __enter__(self) -> ThreadedPwned:
+        ...
+
+    def __exit__(self, *args: object) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def send(self, request: Request[T]) -> Future[T]:
+        ...
+
+    def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        ...
+
+    def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> Future[AltReturnAlias]:
+        ...
+
+    def all_breaches(self, domain: str | None = None) -> Future[ReturnAlias]:
+        ...
+
+    def single_breach(self, name: str) -> Future[ReturnAlias]:
+        ...
+
+    def data_classes(self) -> Future[int | list[str]]:
+        ...
+
+    def search_pastes(self) -> Future[ReturnAlias]:
+        ...
+
+    def search_password(self, password: str) -> Future[int | str]:
+        ...
+
+    def search_hashes(self, hsh: str) -> Future[int | str]:
+        ...
+
+    def breach_index(
+            self,
+            index: BreachIndex | None = None) -> Future[int | BreachIndex]:
+        ...
+
+
+class AsyncPwned:
+
+    core: PwnedCore
+    timeout: int
+
+    def __init__(self, account: str, agent: str, key: str) -> None:
+        ...
+
+    async def send(self, request: Request[T]) -> T:
+        ...
+
+    async def send_all(self, batch: Iterable[Request[T]]) -> list[T]:
+        ...
+
+    async def search_all_breaches(
+            self,
+            truncate: bool | None = False,
+            domain: str | None = None,
+            unverified: bool | None = False) -> AltReturnAlias:
+        ...
+
+    async def all_breaches(self, domain: str | None = None) -> ReturnAlias:
+        ...
+
+    async def single_breach(self, name: str) -> ReturnAlias:
+        ...
+
+    async def data_classes(self) -> int | list[str]:
+        ...
+
+    async def search_pastes(self) -> ReturnAlias:
+        ...
+
+    async def search_password(self, password: str) -> int | str:
+        ...
+
+    async def search_hashes(self, hsh: str) -> int | str:
+        ...
+
+    async def breach_index(self,
+                           index: BreachIndex | None = None
+                           ) -> int | BreachIndex:
+        ...
+
+
+class BreachIndex:
+
+    breaches: dict[str, Mapping[str, object]]
+    classes: dict[str, set[str]]
+    domains: dict[str, set[str]]
+    added: list[tuple[str, str]]
+    breached: list[tuple[str, str]]
+    class_totals: dict[str, int]
+    total: int
+
+    def __init__(self,
+                 breaches: Iterable[Mapping[str, object]] = (),
+                 data_classes: Iterable[str] | None = None) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, name: object) -> bool:
+        ...
+
+    def _add(self, name: str, breach: Mapping[str, object]) -> None:
+        ...
+
+    def _discard(self, name: str) -> None:
+        ...
+
+    def update(self, breaches: Iterable[Mapping[str, object]]) -> None:
+        ...
+
+    def remove(self, name: str) -> None:
+        ...
+
+    def rebuild(self, breaches: Iterable[Mapping[str, object]]) -> None:
+        ...
+
+    def set_data_classes(self, data_classes: Iterable[str]) -> None:
+        ...
+
+    def data_classes(self) -> list[str]:
+        ...
+
+    def with_data_classes(self, *data_classes: str) -> set[str]:
+        ...
+
+    def domain(self, domain: str) -> list[Mapping[str, object]]:
+        ...
+
+    def added_between(self,
+                      start: str | None = None,
+                      end: str | None = None) -> list[str]:
+        ...
+
+    def breached_between(self,
+                         start: str | None = None,
+                         end: str | None = None) -> list[str]:
+        ...
+
+    def pwn_count(self, names: Iterable[str] | None = None) -> int:
+        ...
+
+    def data_class_pwn_count(self, data_class: str) -> int:
+        ...
+
+
+def _copy_breach(breach: Mapping[str, object]) -> dict[str, object]:
+    ...
+
+
+def _str_field(breach: Mapping[str, object], field: str) -> str:
+    ...
+
+
+def _int_field(breach: Mapping[str, object], field: str) -> int:
+    ...
+
+
+def _list_field(breach: Mapping[str, object], field: str) -> list[str]:
+    ...
+
+
+def _date_range(dates: list[tuple[str, str]], start: str | None,
+                end: str | None) -> list[str]:
+    ...
@@ -14,6 +14,8 @@
    GNU General Public License for more details.
 """
 from __future__ import annotations
+import asyncio
+import json
 import unittest
 import random
 from unittest import mock
@@ -21,6 +23,40 @@ from typing import Any
 import requests
 import hibpwned
 
+FAKE_BREACHES: list[dict[str, Any]] = [{
+    "Name": "Adobe",
+    "Domain": "adobe.com",
+    "BreachDate": "2013-10-04",
+    "AddedDate": "2013-12-04T00:00:00Z",
+    "ModifiedDate": "2022-05-15T23:52:49Z",
+    "PwnCount": 152445165,
+    "DataClasses": ["Email addresses", "Password hints", "Passwords",
+                    "Usernames"]
+}, {
+    "Name": "Dubsmash",
+    "Domain": "dubsmash.com",
+    "BreachDate": "2018-12-01",
+    "AddedDate": "2019-02-25T08:25:20Z",
+    "ModifiedDate": "2019-02-25T08:25:20Z",
+    "PwnCount": 161749950,
+    "DataClasses": ["Email addresses", "Passwords", "Phone numbers",
+                    "Usernames"]
+}, {
+    "Name": "Tokopedia",
+    "Domain": "tokopedia.com",
+    "BreachDate": "2020-04-01",
+    "AddedDate": "2020-07-05T00:30:07Z",
+    "ModifiedDate": "2020-07-05T00:30:07Z",
+    "PwnCount": 71232868,
+    "DataClasses": ["Dates of birth", "Email addresses", "Passwords",
+                    "Phone numbers"]
+}]
+
+FAKE_DATA_CLASSES: list[str] = [
+    "Dates of birth", "Email addresses", "Password hints", "Passwords",
+    "Phone numbers", "Usernames", "Vehicle details"
+]
+
 
 # pylint: disable=unused-argument
 def mocked_requests_get(*args: Any, **kwargs: Any) -> Any:
@@ -31,17 +67,22 @@ def mocked_requests_get(*args: Any, **kwargs: Any) -> Any:
     class MockResponse:  # pylint: disable=too-few-public-methods
         """Mock API responses."""
 
-        def __init__(self, response_data: list[dict[str, str]] | list[str]
+        def __init__(self, response_data: list[dict[str, Any]] | list[str]
                      | dict[str, str] | None, status_code: int) -> None:
             self.response_data = response_data
             self.status_code = status_code
 
         def json(
                 self
-        ) -> list[dict[str, str]] | list[str] | dict[str, str] | None:
+        ) -> list[dict[str, Any]] | list[str] | dict[str, str] | None:
             """Returns mocked API response data."""
             return self.response_data
 
+        @property
+        def content(self) -> bytes:
+            """Returns mocked API response body."""
+            return json.dumps(self.response_data).encode("utf-8")
+
     if args[0] == ("https://haveibeenpwned.com/api/v3/breachedaccount/" +
                    fake_email):
         return MockResponse(["FakeSite"], 200)
@@ -58,6 +99,10 @@ def mocked_requests_get(*args: Any, **kwargs: Any) -> Any:
         }, {
             "testKeyTwo": "testValueTwo"
         }], 200)
+    if args[0] == "https://haveibeenpwned.com/api/v3/breaches":
+        return MockResponse(FAKE_BREACHES, 200)
+    if args[0] == "https://haveibeenpwned.com/api/v3/dataclasses":
+        return MockResponse(FAKE_DATA_CLASSES, 200)
     return MockResponse(None, 404)
 
 
@@ -168,6 +213,225 @@ class TestApiCalls(unittest.TestCase):
         if isinstance(pastes_two, list):
             self.assertEqual(pastes_two[1], {"testKeyTwo": "testValueTwo"})
 
+    @mock.patch("hibpwned.requests.get", side_effect=mocked_requests_get)
+    def test_mock_breach_index(self, mock_get: mock.MagicMock) -> None:
+        """Test breach_index against mock API, since we do not
+        have a valid API-Key to test againt the live API."""
+        index = self.pwned.breach_index()
+        self.assertIsInstance(index, hibpwned.BreachIndex)
+        if isinstance(index, hibpwned.BreachIndex):
+            self.assertEqual(len(index), 3)
+            self.assertIn("Vehicle details", index.data_classes())
+            self.assertIs(self.pwned.breach_index(index), index)
+
+    @mock.patch("hibpwned.requests.get", side_effect=mocked_requests_get)
+    def test_mock_reassign_account(self, mock_get: mock.MagicMock) -> None:
+        """Test reassigning account and header changes later queries."""
+        pwned = hibpwned.Pwned(self.email, self.app_name, self.key)
+        pwned.account = self.email_two
+        pastes = pwned.search_pastes()
+        if isinstance(pastes, list):
+            self.assertEqual(pastes[1], {"testKeyTwo": "testValueTwo"})
+        self.assertEqual(
+            pwned.core.search_pastes().url,
+            "https://haveibeenpwned.com/api/v3/pasteaccount/" +
+            self.email_two)
+        pwned.header = {"User-Agent": "other_app"}
+        pwned.search_pastes()
+        self.assertEqual(mock_get.call_args.kwargs["headers"],
+                         {"User-Agent": "other_app"})
+
+    @mock.patch("hibpwned.requests.get", side_effect=mocked_requests_get)
+    def test_mock_threaded(self, mock_get: mock.MagicMock) -> None:
+        """Test the thread pool driver against mock API."""
+        with hibpwned.ThreadedPwned(self.email, self.app_name,
+                                    self.key) as pwned:
+            trunc_data = pwned.search_all_breaches(truncate=True).result()
+            self.assertEqual(trunc_data, ["FakeSite"])
+            pastes = pwned.send_all([
+                pwned.core.search_pastes(),
+                hibpwned.PwnedCore(self.email_two, self.app_name,
+                                   self.key).search_pastes()
+            ])
+            index = pwned.breach_index().result()
+            self.assertIsInstance(index, hibpwned.BreachIndex)
+            if isinstance(index, hibpwned.BreachIndex):
+                self.assertEqual(len(index), 3)
+                self.assertIs(pwned.breach_index(index).result(), index)
+            missing = hibpwned.ThreadedPwned(self.email, self.app_name,
+                                             self.key, max_workers=1)
+            with mock.patch("hibpwned.requests.get",
+                            return_value=mock_get(
+                                "https://www.fart.com")) as not_found:
+                self.assertEqual(missing.breach_index().result(), 404)
+                self.assertEqual(not_found.call_count, 2)
+            missing.close()
+        self.assertEqual(pastes[0], [{"testKey": "testValue"}])
+        self.assertEqual(pastes[1], [{
+            "testKey": "testValue"
+        }, {
+            "testKeyTwo": "testValueTwo"
+        }])
+
+    @mock.patch("hibpwned.requests.get", side_effect=mocked_requests_get)
+    def test_mock_async(self, mock_get: mock.MagicMock) -> None:
+        """Test the asyncio driver against mock API."""
+        pwned = hibpwned.AsyncPwned(self.email, self.app_name, self.key)
+        no_trunc_data = asyncio.run(pwned.search_all_breaches())
+        self.assertEqual(no_trunc_data, [{"testKey": "testValue"}])
+        breaches = asyncio.run(
+            pwned.send_all([pwned.core.all_breaches(),
+                            pwned.core.single_breach("bullshit")]))
+        self.assertEqual(breaches, [FAKE_BREACHES, 404])
+        index = asyncio.run(pwned.breach_index())
+        self.assertIsInstance(index, hibpwned.BreachIndex)
+        if isinstance(index, hibpwned.BreachIndex):
+            self.assertEqual(
+                index.with_data_classes("Passwords", "Phone numbers"),
+                {"Dubsmash", "Tokopedia"})
+
+
+class TestPwnedCore(unittest.TestCase):
+    """Test request building and response parsing without I/O."""
+    core = hibpwned.PwnedCore("test@example.com", "wrapper_test", "No Key")
+
+    def test_requests(self) -> None:
+        """Test request URLs and headers."""
+        request = self.core.search_all_breaches(domain="adobe.com",
+                                                unverified=True)
+        self.assertEqual(
+            request.url, "https://haveibeenpwned.com/api/v3/breachedaccount/"
+            "test@example.com?truncateResponse=false&domain=adobe.com"
+            "&includeUnverified=true")
+        self.assertEqual(request.headers["hibp-api-key"], "No Key")
+        self.assertEqual(self.core.all_breaches().url,
+                         "https://haveibeenpwned.com/api/v3/breaches")
+        self.assertEqual(self.core.search_hashes("21BD1abc").url,
+                         "https://api.pwnedpasswords.com/range/21BD1")
+        self.assertEqual(self.core.search_password("password").url,
+                         "https://api.pwnedpasswords.com/range/5BAA6")
+
+    def test_parse_password(self) -> None:
+        """Test the range suffix scan."""
+        request = self.core.search_password("password")
+        body = (b"1E4C9B93F3F0682250B6CF8331B7EE68FD7:9\r\n"
+                b"1E4C9B93F3F0682250B6CF8331B7EE68FD8:10437277\r\n"
+                b"1E4C9B93F3F0682250B6CF8331B7EE68FD9:3")
+        self.assertEqual(request.parse(200, body), "10437277")
+        self.assertEqual(request.parse(200, body.replace(b"FD8", b"FDA")),
+                         "0")
+        self.assertEqual(
+            hibpwned.parse_password("1E4C9B93F3F0682250B6CF8331B7EE68FD9",
+                                    200, body), "3")
+        self.assertEqual(request.parse(429, b""), 429)
+
+    def test_parse_json(self) -> None:
+        """Test breach and paste decoding."""
+        self.assertEqual(hibpwned.parse_breaches(200, b'{"Name": "Adobe"}'),
+                         [{"Name": "Adobe"}])
+        self.assertEqual(hibpwned.parse_list(200, b'["Passwords"]'),
+                         ["Passwords"])
+        self.assertEqual(hibpwned.parse_list(200, b'{"Name": "Adobe"}'), 200)
+        self.assertEqual(hibpwned.parse_hashes(200, b"ABC:1"), "ABC:1")
+        self.assertEqual(hibpwned.parse_breaches(401, b""), 401)
+        self.assertIsNone(hibpwned.status_message(200, b""))
+        message = hibpwned.status_message(429, b"Retry later")
+        if message is not None:
+            self.assertTrue(message.endswith("Retry later"))
+
+
+class TestBreachIndex(unittest.TestCase):
+    """Test BreachIndex queries and incremental updates."""
+
+    def setUp(self) -> None:
+        self.index = hibpwned.BreachIndex(FAKE_BREACHES, FAKE_DATA_CLASSES)
+
+    def test_with_data_classes(self) -> None:
+        """Test data class intersection."""
+        self.assertEqual(
+            self.index.with_data_classes("Passwords", "Phone numbers"),
+            {"Dubsmash", "Tokopedia"})
+        self.assertEqual(self.index.with_data_classes("Password hints"),
+                         {"Adobe"})
+        self.assertEqual(self.index.with_data_classes("Vehicle details"),
+                         set())
+        self.assertEqual(self.index.with_data_classes("Not a class"), set())
+        self.assertEqual(len(self.index.with_data_classes()), 3)
+
+    def test_domain(self) -> None:
+        """Test domain lookup."""
+        adobe = self.index.domain("Adobe.com")
+        self.assertEqual([breach["Name"] for breach in adobe], ["Adobe"])
+        self.assertEqual(self.index.domain("example.com"), [])
+
+    def test_date_ranges(self) -> None:
+        """Test AddedDate and BreachDate range queries."""
+        self.assertEqual(self.index.added_between("2019-01-01"),
+                         ["Dubsmash", "Tokopedia"])
+        self.assertEqual(
+            self.index.added_between("2013-12-04", "2019-02-25"), ["Adobe"])
+        self.assertEqual(self.index.breached_between(end="2018-12-01"),
+                         ["Adobe"])
+        self.assertEqual(self.index.breached_between(),
+                         ["Adobe", "Dubsmash", "Tokopedia"])
+
+    def test_pwn_count(self) -> None:
+        """Test aggregated PwnCount totals."""
+        self.assertEqual(self.index.pwn_count(), 385427983)
+        self.assertEqual(self.index.pwn_count(["Adobe", "Nope"]), 152445165)
+        self.assertEqual(self.index.data_class_pwn_count("Phone numbers"),
+                         232982818)
+        self.assertEqual(self.index.data_class_pwn_count("Vehicle details"),
+                         0)
+
+    def test_incremental_updates(self) -> None:
+        """Test update, remove and rebuild keep every index in sync."""
+        modified = dict(FAKE_BREACHES[0],
+                        ModifiedDate="2024-01-01T00:00:00Z",
+                        PwnCount=1,
+                        DataClasses=["Phone numbers"])
+        self.index.update([modified])
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.pwn_count(["Adobe"]), 1)
+        self.assertEqual(self.index.with_data_classes("Password hints"),
+                         set())
+        self.assertIn("Adobe",
+                      self.index.with_data_classes("Phone numbers"))
+        self.index.remove("Dubsmash")
+        self.assertNotIn("Dubsmash", self.index)
+        self.assertEqual(self.index.domain("dubsmash.com"), [])
+        self.assertEqual(self.index.added_between(),
+                         ["Adobe", "Tokopedia"])
+        self.index.rebuild(FAKE_BREACHES[1:])
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.pwn_count(), 232982818)
+        self.assertEqual(self.index.breached_between(),
+                         ["Dubsmash", "Tokopedia"])
+        self.index.set_data_classes(["Passwords"])
+        self.assertNotIn("Vehicle details", self.index.data_classes())
+        self.assertIn("Phone numbers", self.index.data_classes())
+
+    def test_mutated_records(self) -> None:
+        """Test records changed by the caller do not desync the index."""
+        breaches = [dict(breach) for breach in FAKE_BREACHES]
+        index = hibpwned.BreachIndex(breaches)
+        breaches[0]["DataClasses"] = ["Vehicle details"]
+        breaches[0]["ModifiedDate"] = "2099-01-01T00:00:00Z"
+        index.update(breaches)
+        self.assertEqual(index.with_data_classes("Vehicle details"),
+                         {"Adobe"})
+        self.assertEqual(index.with_data_classes("Password hints"), set())
+        adobe = index.domain("adobe.com")[0]
+        if isinstance(adobe, dict):
+            adobe["AddedDate"] = "2099-01-01T00:00:00Z"
+            adobe["DataClasses"].append("Passwords")
+        index.remove("Adobe")
+        self.assertEqual(index.added_between(), ["Dubsmash", "Tokopedia"])
+        self.assertEqual(index.with_data_classes("Vehicle details"), set())
+        self.assertEqual(index.with_data_classes("Passwords"),
+                         {"Dubsmash", "Tokopedia"})
+        self.assertEqual(index.pwn_count(), 232982818)
+
 
 if __name__ == "__main__":
     unittest.main()